@@ -10,87 +10,156 @@ Features
 - Crisis safety: if messages look risky, it shares supportive next steps
 - No external libraries required
 
+Requires Python 3.10+ (Context is a dataclass(slots=True)).
+
 Run
     python calmbot.py
 Type `help` inside the chat for commands; `quit` to exit.
 """
 from __future__ import annotations
+import asyncio
+import functools
 import re
+import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Tuple, Callable, Optional
+from typing import AsyncIterator, Deque, Tuple, Optional
 
 # ---------- Helpers ----------
-def normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text.strip().lower())
+_NAME_RE = re.compile(r"\b(?:i am|i'm)\s+([a-zA-Z]{2,})\b")
 
-def contains_any(text: str, words: List[str]) -> bool:
+
+def normalize(text: str) -> str:
+    # Typed chat is often already normalized; these C-level checks let us hand
+    # it back without a copy. isprintable() rules out every whitespace char
+    # except " ", so tabs and newlines still go through the collapse below.
+    if (text.islower() and text.isprintable() and "  " not in text
+            and text[0] != " " and text[-1] != " "):
+        return text
+    # split() with no args drops leading/trailing whitespace and collapses runs
+    return " ".join(text.lower().split())
+
+def contains_any(text: str, words: Tuple[str, ...]) -> bool:
     """Check whether any keyword in `words` appears in `text`."""
     return any(w in text for w in words)
 
 
 # ---------- Exercises ----------
+_BOX_INTRO = "Let's try box breathing (4 steps). We'll do {cycles} cycles."
+_BOX_STEPS = ("Inhale", "Hold", "Exhale", "Hold")
+_BOX_OUTRO = "Nice work. Notice any change in your body right now?"
+
+
 def box_breathing(cycles: int = 3, seconds: int = 4, realtime: bool = False) -> str:
-    lines = [f"Let's try box breathing (4 steps). We'll do {cycles} cycles."]
-    for i in range(1, cycles + 1):
-        lines.append(f"Cycle {i}:")
-        for step in ("Inhale", "Hold", "Exhale", "Hold"):
-            lines.append(f"  {step} for {seconds}…")
-            if realtime:
-                time.sleep(seconds)
-    lines.append("Nice work. Notice any change in your body right now?")
+    if realtime:
+        for _ in range(cycles * len(_BOX_STEPS)):
+            time.sleep(seconds)
+    return _box_breathing_static(cycles, seconds)
+
+
+# The text only depends on (cycles, seconds), so keep the few shapes we use
+@functools.lru_cache(maxsize=32)
+def _box_breathing_static(cycles: int, seconds: int) -> str:
+    # Every cycle reads the same apart from its number, so format the steps once
+    steps = "\n".join(f"  {step} for {seconds}…" for step in _BOX_STEPS)
+    lines = [_BOX_INTRO.format(cycles=cycles)]
+    lines += [f"Cycle {i}:\n{steps}" for i in range(1, cycles + 1)]
+    lines.append(_BOX_OUTRO)
     return "\n".join(lines)
 
 
+_FOUR_SEVEN_EIGHT_INTRO = "We'll try the 4–7–8 breath. We'll do {cycles} cycles."
+# Each step: (line, seconds to pause after it)
+_FOUR_SEVEN_EIGHT_STEPS = (
+    ("  Inhale through your nose for 4…", 4),
+    ("  Hold for 7…", 7),
+    ("  Exhale slowly through your mouth for 8…", 8),
+)
+_FOUR_SEVEN_EIGHT_OUTRO = "Great. Unclench your jaw and drop your shoulders."
+
+
 def four_seven_eight(cycles: int = 3, realtime: bool = False) -> str:
-    lines = [f"We'll try the 4–7–8 breath. We'll do {cycles} cycles."]
-    for i in range(1, cycles + 1):
-        lines.append(f"Cycle {i}:")
-        lines.append("  Inhale through your nose for 4…")
-        if realtime:
-            time.sleep(4)
-        lines.append("  Hold for 7…")
-        if realtime:
-            time.sleep(7)
-        lines.append("  Exhale slowly through your mouth for 8…")
-        if realtime:
-            time.sleep(8)
-    lines.append("Great. Unclench your jaw and drop your shoulders.")
+    if realtime:
+        for _ in range(cycles):
+            for _, seconds in _FOUR_SEVEN_EIGHT_STEPS:
+                time.sleep(seconds)
+    return _four_seven_eight_static(cycles)
+
+
+@functools.lru_cache(maxsize=32)
+def _four_seven_eight_static(cycles: int) -> str:
+    steps = "\n".join(line for line, _ in _FOUR_SEVEN_EIGHT_STEPS)
+    lines = [_FOUR_SEVEN_EIGHT_INTRO.format(cycles=cycles)]
+    lines += [f"Cycle {i}:\n{steps}" for i in range(1, cycles + 1)]
+    lines.append(_FOUR_SEVEN_EIGHT_OUTRO)
     return "\n".join(lines)
 
 
+GROUNDING_TEXT = (
+    "Let's do the 5-4-3-2-1 grounding exercise:\n"
+    "  • Name 5 things you can see\n"
+    "  • 4 things you can feel (chair, clothes, air)\n"
+    "  • 3 things you can hear\n"
+    "  • 2 things you can smell\n"
+    "  • 1 thing you can taste or a slow sip of water\n"
+    "Type a few of yours here—I'll listen."
+)
+
+JOURNAL_TEXT = (
+    "Mini-journal (2 mins):\n"
+    "  1) What happened?\n"
+    "  2) What am I feeling (name it)?\n"
+    "  3) What do I need right now?\n"
+    "  4) One tiny next step?"
+)
+
+
+# Async variants for serving many users from one event loop: they yield the same
+# lines as the realtime exercises, awaiting after each step instead of blocking.
+async def box_breathing_async(cycles: int = 3, seconds: int = 4) -> AsyncIterator[str]:
+    yield _BOX_INTRO.format(cycles=cycles)
+    for i in range(1, cycles + 1):
+        yield f"Cycle {i}:"
+        for step in _BOX_STEPS:
+            yield f"  {step} for {seconds}…"
+            await asyncio.sleep(seconds)
+    yield _BOX_OUTRO
+
+
+async def four_seven_eight_async(cycles: int = 3) -> AsyncIterator[str]:
+    yield _FOUR_SEVEN_EIGHT_INTRO.format(cycles=cycles)
+    for i in range(1, cycles + 1):
+        yield f"Cycle {i}:"
+        for line, seconds in _FOUR_SEVEN_EIGHT_STEPS:
+            yield line
+            await asyncio.sleep(seconds)
+    yield _FOUR_SEVEN_EIGHT_OUTRO
+
+
 def grounding_54321() -> str:
-    return (
-        "Let's do the 5-4-3-2-1 grounding exercise:\n"
-        "  • Name 5 things you can see\n"
-        "  • 4 things you can feel (chair, clothes, air)\n"
-        "  • 3 things you can hear\n"
-        "  • 2 things you can smell\n"
-        "  • 1 thing you can taste or a slow sip of water\n"
-        "Type a few of yours here—I'll listen."
-    )
+    return GROUNDING_TEXT
 
 
 def mini_journal_prompt() -> str:
-    return (
-        "Mini-journal (2 mins):\n"
-        "  1) What happened?\n"
-        "  2) What am I feeling (name it)?\n"
-        "  3) What do I need right now?\n"
-        "  4) One tiny next step?"
-    )
+    return JOURNAL_TEXT
 
 
 # ---------- Safety ----------
-RISKY_PATTERNS = [
-    r"kill myself", r"suicide", r"end my life", r"self-harm", r"cut myself",
-    r"can't go on", r"no reason to live", r"hurt myself"
-]
+# Plain literals: a substring scan is all we need, no regex engine involved.
+RISKY_PATTERNS = (
+    "kill myself", "suicide", "end my life", "self-harm", "cut myself",
+    "can't go on", "no reason to live", "hurt myself"
+)
+
+def _safety(t: str) -> bool:
+    """Like safety_check, for text that is already normalized."""
+    return any(p in t for p in RISKY_PATTERNS)
+
 
 def safety_check(text: str) -> bool:
     """Return True if text contains high-risk patterns."""
-    t = normalize(text)
-    return any(re.search(p, t) for p in RISKY_PATTERNS)
+    return _safety(normalize(text))
 
 SAFETY_MESSAGE = (
     "I'm really glad you told me. You deserve support right now.\n"
@@ -102,108 +171,151 @@ SAFETY_MESSAGE = (
 
 
 # ---------- Context & Types ----------
-@dataclass
+@dataclass(slots=True)
 class Context:
     name: Optional[str] = None
-    last_topics: List[str] = field(default_factory=list)
+    # Only recent topics matter; a bounded ring keeps long sessions flat in memory
+    last_topics: Deque[str] = field(default_factory=lambda: deque(maxlen=16))
 
 Response = Tuple[str, str]  # (intent, message)
 
 
+# ---------- Canned replies ----------
+# Handlers answer with fixed text (the exercises' non-realtime output), so
+# every reply is built once at import rather than on each turn.
+_GREETING_RESP: Response = ("greet", (
+    "Hi, I'm CalmBot. I'm here to listen.\n"
+    "You can type what's on your mind, or say 'breathe', 'ground', or 'journal'."
+))
+_STRESS_RESP: Response = ("stress", (
+    "That sounds heavy. Let's slow things down.\n"
+    + _box_breathing_static(2, 4)
+    + "\nIf you'd rather, we can try grounding—type 'ground'."
+))
+_ANGER_RESP: Response = ("anger", (
+    "I hear a lot of energy there. Two quick options:\n"
+    "• 60-second breath (type 'breathe')\n"
+    "• Write the unfiltered thought, then a kinder reframe starting with 'A more helpful way to see this might be…'"
+))
+_SLEEP_RESP: Response = ("sleep", (
+    "Sleep can be tough when the mind is busy.\n"
+    + _four_seven_eight_static(2)
+    + "\nTip: keep lights dim, put the phone face down after this."
+))
+_GROUNDING_RESP: Response = ("grounding", GROUNDING_TEXT)
+_BREATHING_RESP: Response = ("breathing", _box_breathing_static(3, 4))
+_JOURNAL_RESP: Response = ("journal", JOURNAL_TEXT)
+_HELP_RESP: Response = (
+    "help", "Commands: 'breathe', 'ground', 'journal', or tell me how you're feeling. Type 'quit' to exit."
+)
+
+
 # ---------- CalmBot ----------
 class CalmBot:
+    __slots__ = ("ctx",)
+
+    # Each row: (intent, keywords, handler method name); earlier rows win.
+    # Shared by all instances, so nothing here is rebuilt per bot.
+    _HANDLERS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = tuple(
+        (intent, tuple(sys.intern(k) for k in keys), handler)
+        for intent, keys, handler in (
+            ("greet", ("hi", "hello", "hey", "good morning", "good evening"), "_handle_greeting"),
+            ("stress", ("panic", "anxious", "anxiety", "overwhelmed", "stressed", "stress"), "_handle_stress"),
+            ("anger", ("angry", "frustrated", "mad", "irritated"), "_handle_anger"),
+            ("sleep", ("can't sleep", "insomnia", "sleep"), "_handle_sleep"),
+            ("grounding", ("ground", "54321", "focus"), "_handle_grounding"),
+            ("breathing", ("breathe", "breathing", "box", "4-7-8", "478"), "_handle_breathing"),
+            ("journal", ("journal", "write", "thoughts"), "_handle_journal"),
+            ("help", ("help", "commands", "menu"), "_handle_help"),
+        )
+    )
+
     def __init__(self):
         self.ctx = Context()
-        # Each tuple: (keywords, handler_function)
-        self.handlers: List[Tuple[List[str], Callable[[str], Response]]] = [
-            (["hi", "hello", "hey", "good morning", "good evening"], self._handle_greeting),
-            (["panic", "anxious", "anxiety", "overwhelmed", "stressed", "stress"], self._handle_stress),
-            (["angry", "frustrated", "mad", "irritated"], self._handle_anger),
-            (["can't sleep", "insomnia", "sleep"], self._handle_sleep),
-            (["ground", "54321", "focus"], self._handle_grounding),
-            (["breathe", "breathing", "box", "4-7-8", "478"], self._handle_breathing),
-            (["journal", "write", "thoughts"], self._handle_journal),
-            (["help", "commands", "menu"], self._handle_help),
-        ]
 
     # ---- Handlers ----
     def _handle_greeting(self, text: str) -> Response:
-        msg = (
-            "Hi, I'm CalmBot. I'm here to listen.\n"
-            "You can type what's on your mind, or say 'breathe', 'ground', or 'journal'."
-        )
-        return ("greet", msg)
+        return _GREETING_RESP
 
     def _handle_stress(self, text: str) -> Response:
-        msg = (
-            "That sounds heavy. Let's slow things down.\n"
-            + box_breathing(cycles=2, seconds=4, realtime=False)
-            + "\nIf you'd rather, we can try grounding—type 'ground'."
-        )
-        return ("stress", msg)
+        return _STRESS_RESP
 
     def _handle_anger(self, text: str) -> Response:
-        msg = (
-            "I hear a lot of energy there. Two quick options:\n"
-            "• 60-second breath (type 'breathe')\n"
-            "• Write the unfiltered thought, then a kinder reframe starting with 'A more helpful way to see this might be…'"
-        )
-        return ("anger", msg)
+        return _ANGER_RESP
 
     def _handle_sleep(self, text: str) -> Response:
-        msg = (
-            "Sleep can be tough when the mind is busy.\n"
-            + four_seven_eight(cycles=2, realtime=False)
-            + "\nTip: keep lights dim, put the phone face down after this."
-        )
-        return ("sleep", msg)
+        return _SLEEP_RESP
 
     def _handle_grounding(self, text: str) -> Response:
-        return ("grounding", grounding_54321())
+        return _GROUNDING_RESP
 
     def _handle_breathing(self, text: str) -> Response:
-        return ("breathing", box_breathing(cycles=3, seconds=4, realtime=False))
+        return _BREATHING_RESP
 
     def _handle_journal(self, text: str) -> Response:
-        return ("journal", mini_journal_prompt())
+        return _JOURNAL_RESP
 
     def _handle_help(self, text: str) -> Response:
-        return ("help", "Commands: 'breathe', 'ground', 'journal', or tell me how you're feeling. Type 'quit' to exit.")
+        return _HELP_RESP
 
     # ---- Routing ----
     def reply(self, user_text: str) -> str:
-        # Safety check first (use original text so safety_check normalizes it internally)
-        if safety_check(user_text):
-            return SAFETY_MESSAGE
-
         t = normalize(user_text)
 
-        # Name capture: "I'm <name>" or "I am <name>"
-        m = re.search(r"\b(i am|i'm)\s+([a-zA-Z]{2,})\b", t)
-        if m:
-            # store capitalized name
-            self.ctx.name = m.group(2).capitalize()
+        # Safety check first
+        if _safety(t):
+            return SAFETY_MESSAGE
+
+        self._capture_name(t)
 
-        for keys, handler in self.handlers:
-            if contains_any(t, keys):
-                intent, msg = handler(t)
-                self.ctx.last_topics.append(intent)
-                return self._prefix_name(msg)
+        row = _match_row(t)
+        if row is not None:
+            # Look the handler up by name: storing bound methods on self
+            # would make every bot a reference cycle.
+            intent, msg = getattr(self, self._HANDLERS[row][2])(t)
+            self.ctx.last_topics.append(intent)
+            return self._prefix_name(msg)
 
         # Default empathetic response
         return self._prefix_name(
             "Thanks for sharing. I'm here with you. Would you like to try 'ground' or 'breathe', or tell me more?"
         )
 
+    def _capture_name(self, t: str) -> None:
+        # Name capture: "I'm <name>" or "I am <name>". Most turns contain
+        # neither phrase, so a plain substring test spares the regex.
+        if "i'" not in t and "i am" not in t:
+            return
+        m = _NAME_RE.search(t)
+        if m:
+            # store capitalized name
+            self.ctx.name = m.group(1).capitalize()
+
     def _prefix_name(self, message: str) -> str:
         if self.ctx.name:
             return f"{self.ctx.name}, {message}"
         return message
 
 
+# The matching row depends only on the normalized text, so repeats ("hi",
+# "breathe", "help") skip the scan. Module-level: the cache holds no bot.
+@functools.lru_cache(maxsize=512)
+def _match_row(t: str) -> Optional[int]:
+    """Return the index of the first CalmBot._HANDLERS row with a keyword in `t`."""
+    for i, (_, keys, _) in enumerate(CalmBot._HANDLERS):
+        if contains_any(t, keys):
+            return i
+    return None
+
+
 # ---------- Interactive loop ----------
+_EXIT_CMDS = frozenset({"quit", "exit", "bye"})
+
+
 def chat_loop():
     bot = CalmBot()
+    # input() flushes stdout before prompting, so replies can go out buffered
+    write = sys.stdout.write
     print("CalmBot ready. Type 'help' for options, 'quit' to exit.\n")
     while True:
         try:
@@ -213,10 +325,10 @@ def chat_loop():
             break
         if not user:
             continue
-        if user.lower() in {"quit", "exit", "bye"}:
+        if user.lower() in _EXIT_CMDS:
             print("CalmBot: Sending you a deep breath. Take care.")
             break
-        print("CalmBot:", bot.reply(user))
+        write("CalmBot: " + bot.reply(user) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+import asyncio
+import gc
+import weakref
+
+import pytest
+
+import ai_calmbot
+from ai_calmbot import SAFETY_MESSAGE, CalmBot, normalize
+
+
+def intent_of(text: str) -> str:
+    bot = CalmBot()
+    bot.reply(text)
+    return bot.ctx.last_topics[-1]
+
+
+def test_single_intent_routes_to_its_handler():
+    assert intent_of("I can't sleep") == "sleep"
+    assert intent_of("I feel so angry") == "anger"
+    assert intent_of("show me the menu") == "help"
+
+
+def test_earlier_row_wins_when_several_intents_match():
+    # "stress" is listed before "sleep", whatever order the words come in
+    assert intent_of("can't sleep, so stressed") == "stress"
+    assert intent_of("so stressed, can't sleep") == "stress"
+    # greeting is the first row; "breathe" is much later
+    assert intent_of("breathe with me, hello") == "greet"
+
+
+def test_unmatched_text_gets_default_reply():
+    bot = CalmBot()
+    assert bot.reply("just a quiet day").startswith("Thanks for sharing.")
+    assert not bot.ctx.last_topics
+
+
+def test_repeated_input_still_updates_context():
+    bot = CalmBot()
+    first = bot.reply("breathe")
+    bot.reply("i'm sam")
+    again = bot.reply("breathe")
+    assert list(bot.ctx.last_topics) == ["breathing", "breathing"]
+    assert again == f"Sam, {first}"
+
+
+def test_last_topics_keeps_only_the_16_most_recent():
+    bot = CalmBot()
+    for _ in range(4):
+        bot.reply("i feel angry")
+    for _ in range(16):
+        bot.reply("help")
+    assert len(bot.ctx.last_topics) == 16
+    assert list(bot.ctx.last_topics) == ["help"] * 16
+
+
+def test_bot_is_freed_without_the_cycle_collector():
+    class Probe(CalmBot):  # no __slots__, so it supports weak references
+        pass
+
+    gc.disable()
+    try:
+        bot = Probe()
+        bot.reply("breathe")
+        ref = weakref.ref(bot)
+        del bot
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_name_is_captured_again_after_being_cleared():
+    bot = CalmBot()
+    bot.reply("i'm sam")
+    bot.ctx.name = None
+    assert bot.reply("i'm sam").startswith("Sam, ")
+
+
+def test_normalize_returns_clean_text_unchanged():
+    text = "i can't sleep"
+    assert normalize(text) is text
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("kill\tmyself", "kill myself"),
+    ("kill\nmyself", "kill myself"),
+    ("kill\u00a0myself", "kill myself"),
+    ("  hi there", "hi there"),
+    ("hi there  ", "hi there"),
+    ("hi   there", "hi there"),
+    ("Hi There", "hi there"),
+    ("", ""),
+])
+def test_normalize_collapses_whitespace(raw, expected):
+    assert normalize(raw) == expected
+
+
+@pytest.mark.parametrize("text", ["kill\tmyself", "kill\nmyself", "kill\u00a0myself", " kill myself "])
+def test_safety_sees_through_odd_whitespace(text):
+    assert CalmBot().reply(text) == SAFETY_MESSAGE
+
+
+def collect_async(gen, monkeypatch):
+    pauses = []
+
+    async def fake_sleep(seconds):
+        pauses.append(seconds)
+
+    async def drain():
+        return [line async for line in gen]
+
+    monkeypatch.setattr(ai_calmbot.asyncio, "sleep", fake_sleep)
+    return asyncio.run(drain()), pauses
+
+
+@pytest.mark.parametrize("cycles, seconds", [(0, 4), (1, 4), (3, 5)])
+def test_box_breathing_async_matches_sync_text_and_pauses(monkeypatch, cycles, seconds):
+    lines, pauses = collect_async(ai_calmbot.box_breathing_async(cycles, seconds), monkeypatch)
+    assert lines == ai_calmbot.box_breathing(cycles, seconds).split("\n")
+    assert pauses == [seconds] * 4 * cycles
+
+
+@pytest.mark.parametrize("cycles", [0, 1, 3])
+def test_four_seven_eight_async_matches_sync_text_and_pauses(monkeypatch, cycles):
+    lines, pauses = collect_async(ai_calmbot.four_seven_eight_async(cycles), monkeypatch)
+    assert lines == ai_calmbot.four_seven_eight(cycles).split("\n")
+    assert pauses == [4, 7, 8] * cycles